@@ -18,7 +18,7 @@ def main():
     print("🚀 Starting Red Flags Profits website generation...")
 
     generator = AdaptedLightweightGenerator()
-    success = generator.generate_site()
+    success = generator.generate_site(force="--force" in sys.argv[1:])
 
     if success:
         print("\n🎉 Website generation completed successfully!")